@@ -23,33 +23,75 @@ Usage Examples:
     # List available config files
     python compute_setup.py --list
 
+    # Re-create the compute even if the config is unchanged since the last run
+    python compute_setup.py --force
+
 For detailed configuration help, see README.md
 """
 from __future__ import annotations
 
-import argparse
 import base64
+import hashlib
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# JSON backend: orjson is used when installed (faster, and emits bytes directly)
+try:
+    import orjson
+except ImportError:
+    _loads = json.loads
 
-import dtlpy as dl
-import pkg_resources
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+else:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+
+# dtlpy is imported lazily inside the functions that need it so that
+# lightweight paths (--list, --help, argument errors) skip the SDK import cost.
 
 # Script directory and default paths
 SCRIPT_DIR = Path(__file__).parent
 DEFAULT_CONFIG_FILE = SCRIPT_DIR / "config.json"
 CONFIGS_DIR = SCRIPT_DIR / "configs"
+_SCRIPT_NAME = Path(__file__).name
 
 MIN_DTLpy_VERSION = "1.115.44"
 
+# Allowed/required values used by validate_config
+_PLACEHOLDER_ORG_IDS = frozenset({
+    "{{org-id}}", "<REPLACE: Your Dataloop Organization ID>", "YOUR_ORG_ID_HERE",
+})
+_VALID_ENDPOINT_SCHEMES = ("http://", "https://")
+_ALLOWED_SERVICE_TYPES = frozenset({"ClusterIP", "LoadBalancer"})
+_MANDATORY_PLUGINS = frozenset({"monitoring", "scaler"})
+_ALLOWED_DL_TYPES = frozenset({
+    "regular-xs", "regular-s", "regular-m", "regular-l",
+    "highmem-xs", "highmem-s", "highmem-m", "highmem-l",
+    "gpu-t4", "gpu-t4-m",
+    "gpu-a100-s", "gpu-a100-4g", "gpu-a100-4g-m",
+})
+_ALLOWED_DL_TYPES_SORTED = ", ".join(sorted(_ALLOWED_DL_TYPES))
+
 
 def validate_dtlpy_version() -> None:
     """Fail fast if the installed dtlpy SDK is older than required."""
-    current = getattr(dl, "__version__", "0.0.0")
-    if pkg_resources.parse_version(current) < pkg_resources.parse_version(MIN_DTLpy_VERSION):
+    from importlib.metadata import PackageNotFoundError, version
+
+    from packaging.version import Version
+
+    try:
+        current = version("dtlpy")
+    except PackageNotFoundError:
+        raise RuntimeError(
+            "dtlpy SDK is not installed. "
+            f"Please install: pip install \"dtlpy>={MIN_DTLpy_VERSION}\""
+        ) from None
+    if Version(current) < Version(MIN_DTLpy_VERSION):
         raise RuntimeError(
             f"dtlpy SDK version {current} is too old. "
             f"Minimum required version is {MIN_DTLpy_VERSION}. "
@@ -65,56 +107,71 @@ def list_available_configs() -> List[Path]:
     if DEFAULT_CONFIG_FILE.exists():
         configs.append(DEFAULT_CONFIG_FILE)
     
-    # Check configs directory
-    if CONFIGS_DIR.exists():
-        for config_file in sorted(CONFIGS_DIR.glob("config-*.json")):
-            if "template" not in config_file.name:
-                configs.append(config_file)
-    
+    # Check configs directory (single scandir pass instead of glob + per-entry stat)
+    try:
+        with os.scandir(CONFIGS_DIR) as it:
+            names = [
+                entry.name
+                for entry in it
+                if entry.name.startswith("config-")
+                and entry.name.endswith(".json")
+                and "template" not in entry.name
+                and entry.is_file()
+            ]
+    except OSError:  # missing, not a directory, or unreadable: list nothing (as glob did)
+        names = []
+    names.sort()
+    configs.extend(CONFIGS_DIR / name for name in names)
+
     return configs
 
 
 def print_available_configs() -> None:
     """Print available configuration files."""
     configs = list_available_configs()
-    
-    print("\n📁 Available Configuration Files:")
-    print("=" * 50)
-    
+
+    # Collect output and write it once instead of issuing a print() per line
+    lines = ["\n📁 Available Configuration Files:", "=" * 50]
+
     if not configs:
-        print("  No config files found.")
-        print(f"\n  Create a config file in: {CONFIGS_DIR}/")
-        print("  Or copy the template: configs/config-template.json")
+        lines.append("  No config files found.")
+        lines.append(f"\n  Create a config file in: {CONFIGS_DIR}/")
+        lines.append("  Or copy the template: configs/config-template.json")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
-    
+
     for config_path in configs:
+        rel = config_path.relative_to(SCRIPT_DIR)
         try:
-            with open(config_path, "r") as f:
-                cfg = json.load(f)
+            cfg = load_config(str(config_path))
             namespace = cfg.get("cluster", {}).get("defaultNamespace", "unknown")
             cluster_name = cfg.get("cluster", {}).get("name", "unknown")
             env = cfg.get("organization", {}).get("env", "unknown")
-            
-            print(f"\n  📄 {config_path.relative_to(SCRIPT_DIR)}")
-            print(f"     Cluster: {cluster_name}")
-            print(f"     Namespace: {namespace}")
-            print(f"     Environment: {env}")
+
+            lines.append(f"\n  📄 {rel}")
+            lines.append(f"     Cluster: {cluster_name}")
+            lines.append(f"     Namespace: {namespace}")
+            lines.append(f"     Environment: {env}")
         except (json.JSONDecodeError, KeyError):
-            print(f"\n  📄 {config_path.relative_to(SCRIPT_DIR)} (invalid or incomplete)")
-    
-    print("\n" + "=" * 50)
-    print("\nUsage:")
-    print(f"  python {Path(__file__).name} --config <config-file>")
-    print(f"\nExample:")
-    if configs:
-        example = configs[0].relative_to(SCRIPT_DIR)
-        print(f"  python {Path(__file__).name} --config {example}")
+            lines.append(f"\n  📄 {rel} (invalid or incomplete)")
+
+    lines.append("\n" + "=" * 50)
+    lines.append("\nUsage:")
+    lines.append(f"  python {_SCRIPT_NAME} --config <config-file>")
+    lines.append("\nExample:")
+    example = configs[0].relative_to(SCRIPT_DIR)
+    lines.append(f"  python {_SCRIPT_NAME} --config {example}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _read_json(path: str) -> Any:
+    """Read and parse a JSON file."""
+    return _loads(Path(path).read_bytes())
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from JSON file."""
-    with open(config_path, "r") as f:
-        return json.load(f)
+    return _read_json(config_path)
 
 
 def build_compute_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
@@ -165,6 +222,12 @@ def validate_config(cfg: Dict[str, Any], compute_cfg: Dict[str, Any]) -> None:
     """Validate that required fields are present and correctly formatted."""
     auth = compute_cfg.get("authentication", {})
     conf = compute_cfg.get("config", {})
+    _validate_required(cfg, auth, conf)
+    _validate_semantics(cfg, auth, conf)
+
+
+def _validate_required(cfg: Dict[str, Any], auth: Dict[str, Any], conf: Dict[str, Any]) -> None:
+    """Check required values (token, endpoint, orgId) and the endpoint format."""
     org_id = cfg.get("organization", {}).get("orgId", "")
 
     missing = []
@@ -172,7 +235,7 @@ def validate_config(cfg: Dict[str, Any], compute_cfg: Dict[str, Any]) -> None:
         missing.append("authentication.token")
     if not conf.get("endpoint"):
         missing.append("cluster.endpoint")
-    if not org_id or org_id in ("{{org-id}}", "<REPLACE: Your Dataloop Organization ID>", "YOUR_ORG_ID_HERE"):
+    if not org_id or not isinstance(org_id, str) or org_id in _PLACEHOLDER_ORG_IDS:
         missing.append("organization.orgId")
 
     if missing:
@@ -185,9 +248,13 @@ def validate_config(cfg: Dict[str, Any], compute_cfg: Dict[str, Any]) -> None:
 
     # Validate endpoint format
     endpoint: str = conf["endpoint"]
-    if not (endpoint.startswith("http://") or endpoint.startswith("https://")):
+    if not endpoint.startswith(_VALID_ENDPOINT_SCHEMES):
         raise ValueError("cluster.endpoint must start with http:// or https://")
 
+
+def _validate_semantics(cfg: Dict[str, Any], auth: Dict[str, Any], conf: Dict[str, Any]) -> None:
+    """Warn on missing recommended fields and validate metadata, plugins and nodePools."""
+
     # Warnings for optional but recommended fields
     if not auth.get("ca"):
         print("⚠️  Warning: authentication.ca is empty. Set it if your cluster requires a CA certificate.")
@@ -201,18 +268,22 @@ def validate_config(cfg: Dict[str, Any], compute_cfg: Dict[str, Any]) -> None:
     metadata = cfg.get("metadata") or {}
     serve_agent_service_type = metadata.get("serveAgentServiceType")
     if serve_agent_service_type is not None:
-        allowed_service_types = {"ClusterIP", "LoadBalancer"}
-        if serve_agent_service_type not in allowed_service_types:
+        if serve_agent_service_type not in _ALLOWED_SERVICE_TYPES:
             raise ValueError(
                 "Invalid metadata.serveAgentServiceType: "
-                f"{serve_agent_service_type}. Allowed values: {sorted(allowed_service_types)}"
+                f"{serve_agent_service_type}. Allowed values: {sorted(_ALLOWED_SERVICE_TYPES)}"
             )
 
     # Validate mandatory plugins
     plugins = cfg.get("plugins", [])
-    plugin_names = {p.get("name") for p in plugins if isinstance(p, dict)}
-    mandatory_plugins = {"monitoring", "scaler"}
-    missing_plugins = sorted(mandatory_plugins - plugin_names)
+    non_dict_plugins = [str(idx) for idx, p in enumerate(plugins) if not isinstance(p, dict)]
+    if non_dict_plugins:
+        raise ValueError(
+            "plugins entries must be objects (JSON dicts); invalid entries at index: "
+            + ", ".join(non_dict_plugins)
+        )
+    plugin_names = {p.get("name") for p in plugins}
+    missing_plugins = sorted(_MANDATORY_PLUGINS - plugin_names)
     if missing_plugins:
         raise ValueError(
             "Missing mandatory plugins in config file:\n  - "
@@ -221,49 +292,66 @@ def validate_config(cfg: Dict[str, Any], compute_cfg: Dict[str, Any]) -> None:
             + "\nSee README.md → Plugins for examples."
         )
 
+    # Validate nodePools shape once up front so the per-pool loop can skip type checks
+    node_pools = cfg.get("nodePools", [])
+    non_dict_pools = [str(idx) for idx, pool in enumerate(node_pools) if not isinstance(pool, dict)]
+    if non_dict_pools:
+        raise ValueError(
+            "nodePools entries must be objects (JSON dicts); invalid entries at index: "
+            + ", ".join(non_dict_pools)
+        )
+
     # Validate nodePools.dlTypes values
-    allowed_dl_types = {
-        "regular-xs", "regular-s", "regular-m", "regular-l",
-        "highmem-xs", "highmem-s", "highmem-m", "highmem-l",
-        "gpu-t4", "gpu-t4-m",
-        "gpu-a100-s", "gpu-a100-4g", "gpu-a100-4g-m",
-    }
     invalid_dl_types_by_pool: List[str] = []
-    for idx, pool in enumerate(cfg.get("nodePools", [])):
-        if not isinstance(pool, dict):
-            continue
+    for idx, pool in enumerate(node_pools):
         pool_name = pool.get("name") or f"nodePools[{idx}]"
         dl_types = pool.get("dlTypes", [])
         if not isinstance(dl_types, list):
             invalid_dl_types_by_pool.append(f"{pool_name}: dlTypes must be an array")
             continue
-        invalid = [t for t in dl_types if not isinstance(t, str) or t not in allowed_dl_types]
-        if invalid:
+        # Fast path: a single C-level subset check; only build the detailed list on failure
+        try:
+            all_valid = _ALLOWED_DL_TYPES.issuperset(dl_types)
+        except TypeError:  # unhashable entry (e.g. a nested list)
+            all_valid = False
+        if not all_valid:
+            invalid = [t for t in dl_types if not isinstance(t, str) or t not in _ALLOWED_DL_TYPES]
             invalid_dl_types_by_pool.append(f"{pool_name}: invalid dlTypes: {invalid}")
 
     if invalid_dl_types_by_pool:
-        allowed_list = ", ".join(sorted(allowed_dl_types))
         raise ValueError(
             "Invalid nodePools.dlTypes values:\n  - "
             + "\n  - ".join(invalid_dl_types_by_pool)
             + "\n\nAllowed values:\n  - "
-            + allowed_list
+            + _ALLOWED_DL_TYPES_SORTED
             + "\n\nSee README.md → Node Pools for examples."
         )
 
 
-def encode_config_to_base64(compute_cfg: Dict[str, Any], output_file: str) -> str:
-    """Encode configuration to Base64 and save to file."""
-    json_str = json.dumps(compute_cfg, indent=2)
-    b64 = base64.b64encode(json_str.encode("utf-8")).decode("utf-8")
-    with open(output_file, "w") as f:
-        f.write(b64)
+def encode_config_to_base64(compute_cfg: Dict[str, Any], output_file: str) -> bytes:
+    """Encode configuration to Base64 and save to file.
+
+    The JSON is serialized compactly since the file is only consumed by the SDK.
+    """
+    b64 = base64.b64encode(_dumps(compute_cfg))
+    Path(output_file).write_bytes(b64)
     return b64
 
 
+def _config_digest(b64: bytes, org_id: str, env: str) -> str:
+    """Content hash identifying a compute creation for a (config, org, env) triple."""
+    h = hashlib.blake2b(b64, digest_size=16)
+    h.update(f"\0{org_id}\0{env}".encode("utf-8"))
+    return h.hexdigest()
+
+
 def create_compute(config_file_path: str, org_id: str):
     """Create compute via Dataloop SDK from a Base64-encoded config file."""
+    import dtlpy as dl
+
     print("⏳ Creating compute...")
+    # The SDK only takes a file path here; the Base64 file is also the documented
+    # output artifact, so it is always written rather than passed in memory.
     compute = dl.computes.create_from_config_file(
         config_file_path=config_file_path,
         org_id=org_id
@@ -274,6 +362,8 @@ def create_compute(config_file_path: str, org_id: str):
 
 def set_default_driver(compute_name: str, org_id: str, update_existing_services: bool = False) -> None:
     """Set the created compute as the default driver for the organization."""
+    import dtlpy as dl
+
     print("⏳ Setting compute as default driver...")
     dl.service_drivers.set_default(
         service_driver_id=compute_name,
@@ -283,9 +373,10 @@ def set_default_driver(compute_name: str, org_id: str, update_existing_services:
     print("🎉 Compute has been successfully set as default driver.")
 
 
-def main(config_path: str) -> None:
+def main(config_path: str, force: bool = False) -> None:
     """Main execution flow."""
     validate_dtlpy_version()
+    import dtlpy as dl
 
     # Load configuration
     print(f"\n📂 Loading configuration from: {config_path}")
@@ -299,14 +390,16 @@ def main(config_path: str) -> None:
     namespace = cfg.get("cluster", {}).get("defaultNamespace", "unknown")
 
     # Print configuration summary
-    print("\n" + "=" * 50)
-    print("📋 Configuration Summary")
-    print("=" * 50)
-    print(f"  Cluster:    {cluster_name}")
-    print(f"  Namespace:  {namespace}")
-    print(f"  Provider:   {cfg.get('cluster', {}).get('provider', 'unknown')}")
-    print(f"  Environment: {dataloop_env}")
-    print("=" * 50)
+    sys.stdout.write("\n".join([
+        "\n" + "=" * 50,
+        "📋 Configuration Summary",
+        "=" * 50,
+        f"  Cluster:    {cluster_name}",
+        f"  Namespace:  {namespace}",
+        f"  Provider:   {cfg.get('cluster', {}).get('provider', 'unknown')}",
+        f"  Environment: {dataloop_env}",
+        "=" * 50,
+    ]) + "\n")
 
     # Set Dataloop environment
     dl.setenv(dataloop_env)
@@ -325,6 +418,14 @@ def main(config_path: str) -> None:
     b64 = encode_config_to_base64(compute_cfg, output_file)
     print(f"✅ Base64 config saved (length={len(b64)} chars)")
 
+    # Skip the SDK calls if this exact config was already applied successfully
+    digest = _config_digest(b64, org_id, dataloop_env)
+    digest_file = Path(f"{output_file}.sha")
+    if not force and digest_file.is_file() and digest_file.read_text().strip() == digest:
+        print("\n⏭️  Configuration unchanged since the last successful run; nothing to do.")
+        print("   Re-run with --force to create the compute anyway.")
+        return
+
     # Create compute
     print("\n🚀 Creating Dataloop compute...")
     compute = create_compute(output_file, org_id)
@@ -337,6 +438,9 @@ def main(config_path: str) -> None:
         update_existing_services=False
     )
 
+    # Record the applied config only after everything succeeded
+    digest_file.write_text(digest)
+
     print("\n" + "=" * 50)
     print("✅ Setup completed successfully!")
     print(f"   Cluster: {cluster_name}")
@@ -344,8 +448,10 @@ def main(config_path: str) -> None:
     print("=" * 50)
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+def _build_arg_parser():
+    """Build the full argparse parser (imported lazily; see parse_args)."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Create and configure Dataloop compute from a Kubernetes cluster.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -355,6 +461,7 @@ Examples:
   %(prog)s --config configs/config-faas.json  # Use specific config file
   %(prog)s -c configs/config-prod.json        # Short form
   %(prog)s --list                             # List available configs
+  %(prog)s --force                            # Re-create even if unchanged
 
 For detailed configuration help, see README.md
         """
@@ -373,8 +480,43 @@ For detailed configuration help, see README.md
         action="store_true",
         help="List all available configuration files"
     )
-    
-    return parser.parse_args()
+
+    parser.add_argument(
+        "--force", "-f",
+        action="store_true",
+        help="Create the compute even if the config is unchanged since the last successful run"
+    )
+
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> SimpleNamespace:
+    """Parse command line arguments.
+
+    The common invocations are handled directly; anything else (--help, unknown
+    or abbreviated flags, missing values) goes through argparse for the usual
+    help and error output.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    args = SimpleNamespace(config=str(DEFAULT_CONFIG_FILE), list=False, force=False)
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("--list", "-l"):
+            args.list = True
+        elif arg in ("--force", "-f"):
+            args.force = True
+        elif arg in ("--config", "-c") and i + 1 < len(argv) and not argv[i + 1].startswith("-"):
+            i += 1
+            args.config = argv[i]
+        elif arg.startswith("--config=") and len(arg) > len("--config="):
+            args.config = arg[len("--config="):]
+        else:
+            return SimpleNamespace(**vars(_build_arg_parser().parse_args(argv)))
+        i += 1
+
+    return args
 
 
 if __name__ == "__main__":
@@ -387,13 +529,13 @@ if __name__ == "__main__":
     
     # Run main setup
     try:
-        main(args.config)
+        main(args.config, force=args.force)
     except FileNotFoundError as e:
         print(f"\n❌ Config file not found: {e.filename}")
         print("\nAvailable options:")
         print(f"  1. Create {DEFAULT_CONFIG_FILE}")
         print(f"  2. Copy template: cp configs/config-template.json configs/config-myenv.json")
-        print(f"  3. Specify existing file: python {Path(__file__).name} --config <path>")
+        print(f"  3. Specify existing file: python {_SCRIPT_NAME} --config <path>")
         print(f"\nRun with --list to see available config files")
         sys.exit(1)
     except json.JSONDecodeError as e: